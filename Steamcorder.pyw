@@ -1,20 +1,32 @@
 import os
 import sys
+import io
 import time
 import json
-import ctypes
-import winreg
-import requests
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+import threading
+import functools
+import itertools
+import hashlib
+import math
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from collections import deque, OrderedDict
+# requests, Pillow, the watchdog observers, winreg and ctypes are imported where first used to keep startup fast
+from watchdog.events import PatternMatchingEventHandler, EVENT_TYPE_CREATED, EVENT_TYPE_MOVED, EVENT_TYPE_CLOSED
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QLineEdit, QFileDialog, QTextEdit, QMessageBox, QTabWidget,
     QGroupBox, QSpinBox, QCheckBox, QSystemTrayIcon, QMenu, QStyle
 )
-from PyQt6.QtGui import QFont, QIcon, QCursor, QDesktopServices
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QTimer
+from PyQt6.QtGui import QFont, QIcon, QCursor, QDesktopServices, QTextCursor
+from PyQt6.QtCore import Qt, pyqtSignal, QUrl, QTimer
 
 # ----------------------------------------------------------------------
 # Style Sheet for Dark Theme
@@ -112,49 +124,122 @@ QMessageBox {
 # ----------------------------------------------------------------------
 # Helper function to get resource paths
 # ----------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
 def resource_path(relative_path):
     """Get the absolute path to a resource, works in development and with PyInstaller"""
     if getattr(sys, 'frozen', False):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), relative_path)
 
+@functools.lru_cache(maxsize=None)
+def load_icon(relative_path):
+    """Returns a shared QIcon for a bundled image, decoded once on first use (requires a QApplication)."""
+    return QIcon(resource_path(relative_path))
+
 # ----------------------------------------------------------------------
 # Config file handling
 # ----------------------------------------------------------------------
 CONFIG_FILE = "config.json"
 
+# Concurrent uploads; the HTTP pool is sized to match so no worker waits on a connection
+UPLOAD_WORKERS = 4
+
+# Screenshot formats picked up from the watched folder
+ALLOWED_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.bmp'})
+
+# Screenshots smaller than this are uploaded as-is even when recompression is enabled
+RECOMPRESS_MIN_BYTES = 8 * 1024 * 1024
+
+# Longest wait, in seconds, for a new screenshot to finish being written
+WRITE_TIMEOUT = 30
+
+# How many recently uploaded screenshot hashes are remembered to skip duplicate uploads
+SEEN_HASHES_LIMIT = 512
+
+# Attempts per webhook message before giving up on rate limits or server errors
+UPLOAD_ATTEMPTS = 3
+
+# Longest Retry-After worth waiting for; anything above fails the message instead
+MAX_RETRY_WAIT = 60
+
+# Discord accepts at most this many attachments per webhook message
+MAX_FILES_PER_MESSAGE = 10
+
+# Discord's default limit on the combined attachment size of one message
+MAX_BYTES_PER_MESSAGE = 10 * 1024 * 1024
+
 def get_config_path():
     """Gets the full path to the configuration file."""
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), CONFIG_FILE)
 
+# Bytes last read from or written to config.json, used to skip redundant writes
+_last_written_bytes = None
+# The parsed config, shared by every caller once loaded; it is the source of truth while the app runs
+_config_cache = None
+
 def load_config():
-    """Loads the configuration from config.json."""
+    """Loads the configuration from config.json, reading the file only on first use."""
+    global _last_written_bytes, _config_cache
+    if _config_cache is not None:
+        return _config_cache
+    config = {}
     config_path = get_config_path()
     if os.path.exists(config_path):
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(config_path, "rb") as f:
+                payload = f.read()
+            config = orjson.loads(payload) if orjson else json.loads(payload)
+            _last_written_bytes = payload
         except json.JSONDecodeError:
-            return {}
-    return {}
+            pass
+    _config_cache = config
+    return config
 
 def save_config(config):
-    """Saves the configuration to config.json."""
+    """Saves the configuration to config.json, skipping the write if nothing changed."""
+    global _last_written_bytes, _config_cache
+    _config_cache = config
+    if orjson:
+        payload = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(config, indent=2, ensure_ascii=False).encode("utf-8")
+    if payload == _last_written_bytes:
+        return
     config_path = get_config_path()
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=4)
+    # Write to a temp file and swap it in so a crash never leaves a truncated config
+    tmp_path = config_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, config_path)
+    _last_written_bytes = payload
+
+def parse_webhook_urls(text):
+    """Splits the webhook setting into individual URLs; several may be given, separated by commas."""
+    return [url.strip() for url in text.replace("\n", ",").split(",") if url.strip()]
+
+@functools.lru_cache(maxsize=None)
+def get_app_path():
+    """Gets the path Windows should launch on startup: the frozen exe, or this script."""
+    return sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(sys.argv[0])
 
 def update_startup_registry(enable):
-    """Adds or removes the application from the Windows startup registry."""
+    """Adds or removes the application from the Windows startup registry, writing only if the entry differs."""
+    import winreg
+
     app_name = "Steamcorder"
-    app_path = sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(sys.argv[0])
+    app_value = f'"{get_app_path()}"'
     reg_key = r"Software\Microsoft\Windows\CurrentVersion\Run"
     
     try:
-        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_key, 0, winreg.KEY_SET_VALUE) as key:
-            if enable:
-                winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, f'"{app_path}"')
-            else:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_key, 0, winreg.KEY_QUERY_VALUE | winreg.KEY_SET_VALUE) as key:
+            try:
+                current_value = winreg.QueryValueEx(key, app_name)[0]
+            except FileNotFoundError:
+                current_value = None
+
+            if enable and current_value != app_value:
+                winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, app_value)
+            elif not enable and current_value is not None:
                 winreg.DeleteValue(key, app_name)
     except FileNotFoundError:
         if enable:
@@ -162,6 +247,16 @@ def update_startup_registry(enable):
     except Exception as e:
         print(f"Error updating startup registry: {e}")
 
+def is_network_drive(path):
+    """Returns True if the path lives on a network share, where native change notifications are unreliable."""
+    import ctypes
+
+    drive = os.path.splitdrive(os.path.abspath(path))[0]
+    if not drive:
+        return False
+    DRIVE_REMOTE = 4
+    return ctypes.windll.kernel32.GetDriveTypeW(ctypes.c_wchar_p(drive + "\\")) == DRIVE_REMOTE
+
 def show_silent_message(parent, icon, title, text):
     """Creates and shows a QMessageBox without playing the system sound."""
     msg_box = QMessageBox(parent)
@@ -186,110 +281,397 @@ def show_silent_message(parent, icon, title, text):
 # ----------------------------------------------------------------------
 # File monitoring classes
 # ----------------------------------------------------------------------
-class FileHandler(FileSystemEventHandler):
+class FileHandler(PatternMatchingEventHandler):
     """Handles file system events from watchdog."""
-    def __init__(self, log_callback, webhook_url, delay_seconds, delete_after_upload):
-        super().__init__()
+    HANDLED_EVENTS = frozenset({EVENT_TYPE_CREATED, EVENT_TYPE_MOVED, EVENT_TYPE_CLOSED})
+
+    def __init__(self, log_callback, webhook_urls, delay_seconds, delete_after_upload, recompress, quality):
+        # Let watchdog drop directories and non-image files before they reach our callbacks
+        super().__init__(
+            patterns=[f"*{ext}" for ext in ALLOWED_EXTENSIONS],
+            ignore_directories=True,
+            case_sensitive=False
+        )
         self.log_callback = log_callback
-        self.webhook_url = webhook_url
+        self.webhook_urls = webhook_urls
         self.delay_seconds = delay_seconds
         self.delete_after_upload = delete_after_upload
+        self.recompress = recompress
+        self.quality = quality
+
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # One keep-alive session per handler so only the first upload pays for the TLS handshake
+        self.session = requests.Session()
+        # With several webhooks, run at least one upload per webhook concurrently
+        workers = max(UPLOAD_WORKERS, len(webhook_urls))
+        # Only failed connects are retried here: nothing has been sent yet, so the streamed body is
+        # still unread. Status codes are retried in _post_with_retry, which honours Retry-After per webhook.
+        retries = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5)
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=retries))
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        # Messages are spread round-robin over the webhooks; rate-limited ones are parked until usable again
+        self._webhook_cycle = itertools.cycle(webhook_urls)
+        self._parked_until = {}  # url -> time.monotonic() deadline
+        self._write_done = {}  # path -> Event set once the writer closes the file
+        self._pending = []  # (path, name, creation_time) waiting for the batch window to close
+        self._pending_lock = threading.Lock()
+        self._batch_timer = None
+        self._closed = threading.Event()  # set by close(); every wait in the workers is cut short by it
+        self._seen_hashes = OrderedDict()  # content digests of recently uploaded screenshots, oldest first
+        self._pending_digests = {}  # path -> content digest, recorded as seen once the upload succeeds
+        self._seen_lock = threading.Lock()
+
+    def dispatch(self, event):
+        # Every write to a screenshot also fires a modified event; drop those before pattern matching
+        if event.event_type in self.HANDLED_EVENTS:
+            super().dispatch(event)
 
     def on_created(self, event):
-        if event.is_directory:
+        self._track(event.src_path)
+
+    def on_moved(self, event):
+        # Catches writers that save to a temporary name and rename into place;
+        # the handler also sees renames *away* from an image name, which are skipped
+        if os.path.splitext(event.dest_path)[1].lower() in ALLOWED_EXTENSIONS:
+            self._track(event.dest_path)
+
+    def _track(self, file_path):
+        # Duplicate events for a file that is already waiting to be written are dropped
+        if file_path in self._write_done:
             return
-        
-        file_path = event.src_path
-        
+        # Keep watchdog's dispatcher free; the wait and the upload happen on the pool
+        creation_time = time.time()
+        self._write_done[file_path] = threading.Event()
+        self.pool.submit(self._delayed_upload, file_path, os.path.basename(file_path), creation_time)
+
+    def on_closed(self, event):
+        # Only emitted by backends that report close-after-write; elsewhere the size probe decides
+        write_done = self._write_done.get(event.src_path)
+        if write_done:
+            write_done.set()
+
+    def _wait_until_written(self, file_path, write_done):
+        """Blocks until the writer closes the file or its size stops changing, for at most WRITE_TIMEOUT seconds."""
+        deadline = time.monotonic() + WRITE_TIMEOUT
+        last_size = -1
+        while time.monotonic() < deadline and not self._closed.is_set():
+            current_size = os.stat(file_path).st_size
+            if current_size > 0 and (write_done.is_set() or current_size == last_size):
+                try:
+                    # On Windows this fails while the writer still holds the file without read sharing
+                    with open(file_path, 'rb'):
+                        return
+                except PermissionError:
+                    pass
+            last_size = current_size
+            # Not write_done.wait: once set it returns at once, which would busy-loop on an empty or locked file
+            self._closed.wait(0.05)
+        if not self._closed.is_set():
+            raise TimeoutError
+
+    def _delayed_upload(self, file_path, name, creation_time):
+        write_done = self._write_done.get(file_path) or threading.Event()
         try:
-            last_size = -1
-            stable_checks = 0
-            while stable_checks < 3:
-                if not os.path.exists(file_path):
-                    self.log_callback.emit(f"File '{os.path.basename(file_path)}' was removed before processing.", "warning")
-                    return
-                current_size = os.path.getsize(file_path)
-                if current_size == last_size and current_size > 0:
-                    stable_checks += 1
-                else:
-                    stable_checks = 0
-                last_size = current_size
-                time.sleep(0.5)
+            self._wait_until_written(file_path, write_done)
         except FileNotFoundError:
-             self.log_callback.emit(f"File '{os.path.basename(file_path)}' vanished during stability check.", "warning")
-             return
+            self.log_callback(f"File '{name}' was removed before processing.", "warning")
+            return
+        except TimeoutError:
+            self.log_callback(f"File '{name}' was still being written after {WRITE_TIMEOUT}s, skipped.", "warning")
+            return
+        finally:
+            self._write_done.pop(file_path, None)
+        if self._closed.is_set():
+            return
 
-        creation_time = time.time()
-        self.log_callback.emit(f"Detected: {os.path.basename(file_path)}", "info")
+        key = self._content_digest(file_path)
+        duplicate = self._claim_digest(file_path, key) if key is not None else None
+        if duplicate == 'uploaded':
+            self.log_callback(f"Skipped '{name}' (already uploaded recently).", "info")
+            if self.delete_after_upload:
+                self._delete_file(file_path, name)
+            return
+        if duplicate == 'pending':
+            # Kept on disk: the identical copy being uploaded may still fail
+            self.log_callback(f"Skipped '{name}' (identical to a screenshot being uploaded).", "info")
+            return
 
-        if self.delay_seconds > 0:
-            time.sleep(self.delay_seconds)
-            
-        if self.is_allowed_file(file_path):
-            self.upload_file(file_path, creation_time)
-        else:
-            self.log_callback.emit(f"Ignored '{os.path.basename(file_path)}' (unsupported type).", "warning")
+        self.log_callback(f"Detected: {name}", "info")
+        self._add_to_batch(file_path, name, creation_time)
 
-    def is_allowed_file(self, file_path):
-        return os.path.splitext(file_path)[1].lower() in {'.png', '.jpg', '.jpeg', '.gif', '.bmp'}
+    def _content_digest(self, file_path):
+        """Returns a BLAKE2b digest of the file's content, or None if it cannot be read."""
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+        except (OSError, ValueError):
+            return None
+        return digest.digest()
+
+    def _claim_digest(self, file_path, key):
+        """Registers the digest as in flight for file_path.
 
-    def upload_file(self, file_path, creation_time):
-        if not self.webhook_url:
-            self.log_callback.emit("No webhook URL set in Settings!", "error")
+        Returns 'uploaded' or 'pending' instead if the same content was already sent or is being sent.
+        """
+        with self._seen_lock:
+            if key in self._seen_hashes:
+                self._seen_hashes.move_to_end(key)
+                return 'uploaded'
+            if key in self._pending_digests.values():
+                return 'pending'
+            self._pending_digests[file_path] = key
+        return None
+
+    def _settle_digests(self, batch, uploaded):
+        """Drops the pending digests of a batch, remembering them only if the upload succeeded."""
+        for file_path, _, _ in batch:
+            with self._seen_lock:
+                key = self._pending_digests.pop(file_path, None)
+                if key is None or not uploaded:
+                    continue
+                self._seen_hashes[key] = None
+                self._seen_hashes.move_to_end(key)
+                if len(self._seen_hashes) > SEEN_HASHES_LIMIT:
+                    self._seen_hashes.popitem(last=False)
+
+    def _delete_file(self, file_path, name):
+        try:
+            os.remove(file_path)
+            self.log_callback(f"Deleted {name} after upload.", "info")
+        except OSError as e:
+            self.log_callback(f"Error deleting file: {e}", "error")
+
+    def _add_to_batch(self, file_path, name, creation_time):
+        """Queues a file; everything queued within delay_seconds of the oldest queued file is posted together."""
+        with self._pending_lock:
+            if self._closed.is_set() or any(path == file_path for path, _, _ in self._pending):
+                return
+            self._pending.append((file_path, name, creation_time))
+            if len(self._pending) >= MAX_FILES_PER_MESSAGE:
+                # A full message is ready; no point holding it for the rest of the window
+                self._flush_pending()
+            elif not self._batch_timer:
+                self._batch_timer = threading.Timer(self.delay_seconds, self._flush_batch)
+                self._batch_timer.daemon = True
+                self._batch_timer.start()
+
+    def _flush_batch(self):
+        with self._pending_lock:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        """Submits everything queued, split into messages that fit Discord's limits; the caller holds _pending_lock."""
+        if self._batch_timer:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        if self._closed.is_set():
             return
+        # Workers finish their write checks in any order; attach files in the order they were taken
+        self._pending.sort(key=lambda item: item[2])
+        batch, batch_bytes = [], 0
+        for item in self._pending:
+            try:
+                size = os.path.getsize(item[0])
+            except OSError:
+                size = 0
+            # Start a new message when this file would go over either limit; a file that is too
+            # large on its own still goes out alone
+            if batch and (len(batch) == MAX_FILES_PER_MESSAGE or batch_bytes + size > MAX_BYTES_PER_MESSAGE):
+                self.pool.submit(self.upload_files, batch)
+                batch, batch_bytes = [], 0
+            batch.append(item)
+            batch_bytes += size
+        if batch:
+            self.pool.submit(self.upload_files, batch)
+        self._pending.clear()
+
+    def _open_for_upload(self, file_path, name, stack):
+        """Returns the (filename, file object, content type) multipart entry for a screenshot."""
+        base, ext = os.path.splitext(name)
+        # GIFs may be animated, so they are always sent as-is; small files are not worth the encode time
+        if self.recompress and ext.lower() != '.gif' and os.path.getsize(file_path) >= RECOMPRESS_MIN_BYTES:
+            from PIL import Image
+            buf = io.BytesIO()
+            try:
+                with Image.open(file_path) as img:
+                    img.save(buf, 'WEBP', quality=self.quality, method=4)
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                self.log_callback(f"Could not recompress '{name}' ({e}), sending the original.", "warning")
+            else:
+                buf.seek(0)
+                return (f"{base}.webp", buf, 'image/webp')
+        return (name, stack.enter_context(open(file_path, 'rb')), 'application/octet-stream')
+
+    def _next_webhook(self):
+        """Returns the next webhook in rotation, waiting if every one of them is rate limited; None once closed."""
+        while not self._closed.is_set():
+            now = time.monotonic()
+            for _ in range(len(self.webhook_urls)):
+                url = next(self._webhook_cycle)
+                if self._parked_until.get(url, 0) <= now:
+                    return url
+            # Another worker may have parked a webhook for zero seconds since the check above
+            self._closed.wait(max(0, min(self._parked_until.values()) - now))
+        return None
+
+    def _post_with_retry(self, files, parts):
+        """Posts to a webhook, retrying rate limits and server errors with exponential backoff.
+
+        Returns None if monitoring stops before the message could be sent.
+        """
+        from requests_toolbelt import MultipartEncoder
+
+        for attempt in range(UPLOAD_ATTEMPTS):
+            url = self._next_webhook()
+            if url is None or self._closed.is_set():
+                return None
+            for _, f, _ in parts:
+                f.seek(0)
+            # Streams the files from disk in chunks with an exact Content-Length, instead of
+            # requests building the whole multipart body in memory first
+            body = MultipartEncoder(fields=files)
+            response = self.session.post(url, data=body, headers={'Content-Type': body.content_type}, timeout=(5, 30))
+            retryable = response.status_code == 429 or 500 <= response.status_code < 600
+            if not retryable or attempt == UPLOAD_ATTEMPTS - 1:
+                return response
+            # Discord sends Retry-After in seconds on rate limits
+            try:
+                wait = float(response.headers.get('Retry-After', 2 ** attempt))
+            except ValueError:
+                wait = 2 ** attempt
+            if not math.isfinite(wait):
+                wait = 2 ** attempt
+            wait = max(0.0, wait)
+            if response.status_code == 429:
+                # Only this webhook is limited; the retry goes to the next free one, and only
+                # waits in _next_webhook if every webhook is parked
+                self._parked_until[url] = time.monotonic() + min(wait, MAX_RETRY_WAIT)
+            if wait > MAX_RETRY_WAIT:
+                self.log_callback(
+                    f"Discord asked to wait {wait:.0f}s (over {MAX_RETRY_WAIT}s), giving up on this message.", "error"
+                )
+                return response
+            if response.status_code == 429:
+                if len(self.webhook_urls) > 1:
+                    webhook_number = self.webhook_urls.index(url) + 1
+                    self.log_callback(f"Webhook {webhook_number} is rate limited, parked for {wait:.1f}s.", "warning")
+                else:
+                    self.log_callback(f"Discord returned 429, retrying in {wait:.1f}s...", "warning")
+            else:
+                self.log_callback(f"Discord returned {response.status_code}, retrying in {wait:.1f}s...", "warning")
+                if self._closed.wait(wait):
+                    return None
+
+    def upload_files(self, batch):
+        """Posts up to MAX_FILES_PER_MESSAGE screenshots to the webhook in a single message."""
+        import requests
+        if not self.webhook_urls:
+            self.log_callback("No webhook URL set in Settings!", "error")
+            self._settle_digests(batch, uploaded=False)
+            return
+        uploaded = False
         try:
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
-
-            files = {'file': (os.path.basename(file_path), file_data)}
-            start_request = time.perf_counter()
-            response = requests.post(self.webhook_url, files=files)
-            upload_duration = time.perf_counter() - start_request
-            total_duration = time.time() - creation_time
+            with ExitStack() as stack:
+                parts = [self._open_for_upload(file_path, name, stack) for file_path, name, _ in batch]
+                if len(parts) == 1:
+                    files = {'file': parts[0]}
+                else:
+                    files = [(f'files[{i}]', part) for i, part in enumerate(parts)]
+                start_request = time.perf_counter()
+                response = self._post_with_retry(files, parts)
+                upload_duration = time.perf_counter() - start_request
+            total_duration = time.time() - min(creation_time for _, _, creation_time in batch)
+
+            if response is None:
+                self.log_callback(f"Monitoring stopped, {len(batch)} screenshot(s) not uploaded.", "warning")
+                return
+
+            # A bad request or an oversized body can be down to one file or the combined size;
+            # sending the files on their own still gets the rest through
+            if response.status_code in (400, 413) and len(batch) > 1:
+                self.log_callback(f"Discord rejected the batch ({response.status_code}), uploading files one by one.", "warning")
+                # Each single-file upload settles its own digest
+                for item in batch:
+                    self.upload_files([item])
+                return
             
             response.raise_for_status()
+            uploaded = True
 
-            self.log_callback.emit(f"Uploaded in {upload_duration:.2f}s (total: {total_duration:.2f}s).", "success")
+            if len(batch) == 1:
+                self.log_callback(f"Uploaded in {upload_duration:.2f}s (total: {total_duration:.2f}s).", "success")
+            else:
+                self.log_callback(f"Uploaded {len(batch)} screenshots in {upload_duration:.2f}s (total: {total_duration:.2f}s).", "success")
             
             if self.delete_after_upload:
-                try:
-                    os.remove(file_path)
-                    self.log_callback.emit("Deleted screenshot after upload.", "info")
-                except OSError as e:
-                    self.log_callback.emit(f"Error deleting file: {e}", "error")
+                for file_path, name, _ in batch:
+                    self._delete_file(file_path, name)
         except requests.exceptions.RequestException as e:
-            self.log_callback.emit(f"Upload failed: {e}", "error")
-        except FileNotFoundError:
-             self.log_callback.emit(f"Could not find {file_path} for upload.", "error")
+            self.log_callback(f"Upload failed: {e}", "error")
+        except FileNotFoundError as e:
+             self.log_callback(f"Could not find {e.filename} for upload.", "error")
         except Exception as e:
-            self.log_callback.emit(f"An unexpected error occurred during upload: {e}", "error")
-
-
-class MonitoringThread(QThread):
-    log_signal = pyqtSignal(str, str) # message, level
-
-    def __init__(self, watch_directory, webhook_url, delay_seconds, delete_after_upload):
-        super().__init__()
+            self.log_callback(f"An unexpected error occurred during upload: {e}", "error")
+        finally:
+            self._settle_digests(batch, uploaded)
+
+    def close(self):
+        """Cancels queued uploads and releases the worker pool and HTTP session."""
+        with self._pending_lock:
+            self._closed.set()
+            if self._batch_timer:
+                self._batch_timer.cancel()
+            self._pending.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+
+class Monitor:
+    """Owns the watchdog observer; watchdog and the upload pool provide the threads."""
+    def __init__(self, log_callback, watch_directory, webhook_urls, delay_seconds, delete_after_upload, poll_interval, recompress, quality):
+        self.log_callback = log_callback
         self.watch_directory = watch_directory
-        self.webhook_url = webhook_url
+        self.webhook_urls = webhook_urls
         self.delay_seconds = delay_seconds
         self.delete_after_upload = delete_after_upload
+        self.poll_interval = poll_interval
+        self.recompress = recompress
+        self.quality = quality
         self.observer = None
         self.file_handler = None
 
-    def run(self):
-        self.log_signal.emit(f"Monitoring started for: {self.watch_directory}", "info")
-        self.file_handler = FileHandler(self.log_signal, self.webhook_url, self.delay_seconds, self.delete_after_upload)
-        self.observer = Observer()
+    def start(self):
+        from watchdog.observers import Observer
+        from watchdog.observers.polling import PollingObserver
+
+        self.log_callback(f"Monitoring started for: {self.watch_directory}", "info")
+        self.file_handler = FileHandler(
+            self.log_callback, self.webhook_urls, self.delay_seconds, self.delete_after_upload,
+            self.recompress, self.quality
+        )
+        if is_network_drive(self.watch_directory):
+            # ReadDirectoryChangesW misses events on SMB/CIFS shares, so scan the folder instead
+            self.log_callback(f"Network folder detected, polling every {self.poll_interval}s.", "info")
+            self.observer = PollingObserver(timeout=self.poll_interval)
+        else:
+            self.observer = Observer()
         self.observer.schedule(self.file_handler, path=self.watch_directory, recursive=False)
         self.observer.start()
-        self.observer.join()
+
+    def is_running(self):
+        return self.observer is not None and self.observer.is_alive()
 
     def stop(self):
-        if self.observer and self.observer.is_alive():
+        if self.is_running():
             self.observer.stop()
             self.observer.join()
-            self.log_signal.emit("Monitoring stopped.", "info")
+            self.log_callback("Monitoring stopped.", "info")
+        if self.file_handler:
+            self.file_handler.close()
 
     def update_delay(self, new_delay):
         if self.file_handler:
@@ -299,6 +681,11 @@ class MonitoringThread(QThread):
         if self.file_handler:
             self.file_handler.delete_after_upload = delete_enabled
 
+    def update_recompress_option(self, recompress, quality):
+        if self.file_handler:
+            self.file_handler.recompress = recompress
+            self.file_handler.quality = quality
+
 
 # ----------------------------------------------------------------------
 # Settings tab widget
@@ -306,6 +693,7 @@ class MonitoringThread(QThread):
 class SettingsTab(QWidget):
     settings_updated = pyqtSignal(int)
     delete_option_changed = pyqtSignal(bool)
+    recompress_option_changed = pyqtSignal(bool, int)
 
     def __init__(self, config):
         super().__init__()
@@ -334,6 +722,7 @@ class SettingsTab(QWidget):
         webhook_layout = QHBoxLayout()
         webhook_layout.addWidget(QLabel("Webhook URL:"))
         self.webhook_edit = QLineEdit(self.config.get("webhook_url", ""))
+        self.webhook_edit.setToolTip("Separate several webhook URLs with commas to spread uploads across them.")
         if self.config.get("webhook_hidden", False):
             self.webhook_edit.setEchoMode(QLineEdit.EchoMode.Password)
         self.toggle_webhook_btn = QPushButton("Show" if self.config.get("webhook_hidden", False) else "Hide")
@@ -352,17 +741,45 @@ class SettingsTab(QWidget):
         main_layout.addWidget(options_group)
 
         delay_layout = QHBoxLayout()
-        delay_layout.addWidget(QLabel("Upload Delay (seconds):"))
+        delay_layout.addWidget(QLabel("Batch Window (seconds):"))
         self.delay_spin = QSpinBox()
         self.delay_spin.setRange(0, 30)
         self.delay_spin.setValue(self.config.get("upload_delay", 2))
+        self.delay_spin.setToolTip(
+            "Screenshots taken within this many seconds of the first one are sent together in one message.\n"
+            "Files are always uploaded only once they have finished saving."
+        )
         delay_layout.addStretch(1)
         delay_layout.addWidget(self.delay_spin)
         options_layout.addLayout(delay_layout)
 
+        poll_layout = QHBoxLayout()
+        poll_layout.addWidget(QLabel("Network Folder Poll Interval (seconds):"))
+        self.poll_spin = QSpinBox()
+        self.poll_spin.setRange(1, 60)
+        self.poll_spin.setValue(self.config.get("poll_interval", 5))
+        poll_layout.addStretch(1)
+        poll_layout.addWidget(self.poll_spin)
+        options_layout.addLayout(poll_layout)
+
         self.delete_cb = QCheckBox("Delete files after successful upload")
         self.delete_cb.setChecked(self.config.get("delete_after_upload", False))
         options_layout.addWidget(self.delete_cb)
+
+        recompress_layout = QHBoxLayout()
+        self.recompress_cb = QCheckBox("Recompress large screenshots (8 MB+) to WebP")
+        self.recompress_cb.setChecked(self.config.get("recompress", False))
+        self.quality_spin = QSpinBox()
+        self.quality_spin.setRange(1, 100)
+        self.quality_spin.setPrefix("Quality: ")
+        self.quality_spin.setValue(self.config.get("recompress_quality", 90))
+        self.quality_spin.setEnabled(self.recompress_cb.isChecked())
+        self.recompress_cb.toggled.connect(self.quality_spin.setEnabled)
+        recompress_layout.addWidget(self.recompress_cb)
+        recompress_layout.addStretch(1)
+        recompress_layout.addWidget(self.quality_spin)
+        options_layout.addLayout(recompress_layout)
+
         self.minimize_cb = QCheckBox("Minimize to system tray on close")
         self.minimize_cb.setChecked(self.config.get("minimize_on_exit", False))
         options_layout.addWidget(self.minimize_cb)
@@ -401,8 +818,10 @@ class SettingsTab(QWidget):
             self.toggle_webhook_btn.setText("Hide")
 
     def test_webhook(self):
-        url = self.webhook_edit.text()
-        if not url.startswith("https://discord.com/api/webhooks/"):
+        import requests
+
+        urls = parse_webhook_urls(self.webhook_edit.text())
+        if not urls or not all(url.startswith("https://discord.com/api/webhooks/") for url in urls):
             show_silent_message(self, QMessageBox.Icon.Warning, "Invalid URL", "Please enter a valid Discord webhook URL.")
             return
         
@@ -413,8 +832,9 @@ class SettingsTab(QWidget):
 
         payload = {"content": "✅ **Steamcorder: Webhook test successful!**"}
         try:
-            response = requests.post(url, json=payload, timeout=10)
-            response.raise_for_status()
+            for url in urls:
+                response = requests.post(url, json=payload, timeout=10)
+                response.raise_for_status()
             show_silent_message(self, QMessageBox.Icon.Information, "Success", "Test message sent to your Discord channel.")
         except requests.exceptions.RequestException as e:
             show_silent_message(self, QMessageBox.Icon.Critical, "Webhook Test Failed", f"Failed to send test message.\n\nError: {e}")
@@ -441,9 +861,12 @@ class SettingsTab(QWidget):
         self.config["webhook_url"] = self.webhook_edit.text()
         self.config["webhook_hidden"] = (self.webhook_edit.echoMode() == QLineEdit.EchoMode.Password)
         self.config["upload_delay"] = self.delay_spin.value()
+        self.config["poll_interval"] = self.poll_spin.value()
         self.config["minimize_on_exit"] = self.minimize_cb.isChecked()
         self.config["start_on_startup"] = self.startup_cb.isChecked()
         self.config["delete_after_upload"] = self.delete_cb.isChecked()
+        self.config["recompress"] = self.recompress_cb.isChecked()
+        self.config["recompress_quality"] = self.quality_spin.value()
         
         save_config(self.config)
         update_startup_registry(self.startup_cb.isChecked())
@@ -454,6 +877,7 @@ class SettingsTab(QWidget):
         
         self.settings_updated.emit(self.delay_spin.value())
         self.delete_option_changed.emit(self.delete_cb.isChecked())
+        self.recompress_option_changed.emit(self.recompress_cb.isChecked(), self.quality_spin.value())
 
     def join_discord(self):
         QDesktopServices.openUrl(QUrl("https://discord.gg/dMvCH93sYX"))
@@ -468,13 +892,28 @@ class SteamcorderMainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.config = load_config()
-        self.monitoring_thread = None
+        self.monitor = None
+
+        # Coalesces bursts of config changes into a single write
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._flush_config)
+
+        # Log lines are buffered and written to the log view in batches. log() only appends to
+        # the deque, so watchdog and upload threads call it directly instead of via a queued signal.
+        self._log_buffer = deque(maxlen=1000)
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
         
         self.init_tray_icon()
         self.init_ui()
         
         self.settings_tab.settings_updated.connect(self.update_monitoring_delay)
         self.settings_tab.delete_option_changed.connect(self.update_monitoring_delete_option)
+        self.settings_tab.recompress_option_changed.connect(self.update_monitoring_recompress_option)
 
         # Automatically start monitoring on launch if it was active before closing
         if self.config.get("monitoring_active", False):
@@ -482,8 +921,7 @@ class SteamcorderMainWindow(QMainWindow):
                 self.toggle_monitoring()
 
     def init_tray_icon(self):
-        icon_path = resource_path("icon.ico")
-        self.tray_icon = QSystemTrayIcon(QIcon(icon_path), self)
+        self.tray_icon = QSystemTrayIcon(load_icon("icon.ico"), self)
         self.tray_icon.setToolTip(f"Steamcorder {self.APP_VERSION}")
         
         self.tray_menu = QMenu(self)
@@ -498,9 +936,9 @@ class SteamcorderMainWindow(QMainWindow):
 
     def init_ui(self):
         self.setWindowTitle(f"Steamcorder {self.APP_VERSION}")
-        self.setWindowIcon(QIcon(resource_path("icon.ico")))
-        self.setGeometry(100, 100, 550, 580)
-        self.setMinimumSize(500, 540)
+        self.setWindowIcon(load_icon("icon.ico"))
+        self.setGeometry(100, 100, 550, 640)
+        self.setMinimumSize(500, 600)
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -542,18 +980,23 @@ class SteamcorderMainWindow(QMainWindow):
         log_layout = QVBoxLayout(log_group)
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.document().setMaximumBlockCount(500)
         log_layout.addWidget(self.log_text)
         layout.addWidget(log_group, 1)
 
         return dashboard_widget
 
     def update_monitoring_delay(self, new_delay):
-        if self.monitoring_thread and self.monitoring_thread.isRunning():
-            self.monitoring_thread.update_delay(new_delay)
+        if self.monitor and self.monitor.is_running():
+            self.monitor.update_delay(new_delay)
 
     def update_monitoring_delete_option(self, delete_enabled):
-        if self.monitoring_thread and self.monitoring_thread.isRunning():
-            self.monitoring_thread.update_delete_option(delete_enabled)
+        if self.monitor and self.monitor.is_running():
+            self.monitor.update_delete_option(delete_enabled)
+
+    def update_monitoring_recompress_option(self, recompress, quality):
+        if self.monitor and self.monitor.is_running():
+            self.monitor.update_recompress_option(recompress, quality)
 
     def set_status_label(self, is_running):
         """Updates the status label with colored dot indicator."""
@@ -564,36 +1007,43 @@ class SteamcorderMainWindow(QMainWindow):
         self.status_label.setText(text)
         
     def toggle_monitoring(self):
-        if self.monitoring_thread and self.monitoring_thread.isRunning():
-            self.monitoring_thread.stop()
-            self.monitoring_thread = None
+        if self.monitor and self.monitor.is_running():
+            self.monitor.stop()
+            self.monitor = None
             self.monitor_btn.setText("Start Monitoring")
             self.set_status_label(False)
             self.config["monitoring_active"] = False
         else:
-            self.config = load_config()
             watch_dir = self.config.get("watch_directory")
-            webhook_url = self.config.get("webhook_url")
+            webhook_urls = parse_webhook_urls(self.config.get("webhook_url", ""))
 
             if not watch_dir or not os.path.isdir(watch_dir):
                 show_silent_message(self, QMessageBox.Icon.Warning, "Error", "Please select a valid folder in Settings.")
                 return
-            if not webhook_url:
+            if not webhook_urls:
                 show_silent_message(self, QMessageBox.Icon.Warning, "Error", "Please enter a webhook URL in Settings.")
                 return
 
             delay = self.config.get("upload_delay", 2)
             delete_opt = self.config.get("delete_after_upload", False)
+            poll_interval = self.config.get("poll_interval", 5)
+            recompress = self.config.get("recompress", False)
+            quality = self.config.get("recompress_quality", 90)
             
-            self.monitoring_thread = MonitoringThread(watch_dir, webhook_url, delay, delete_opt)
-            self.monitoring_thread.log_signal.connect(self.log)
-            self.monitoring_thread.start()
+            self.monitor = Monitor(
+                self.log, watch_dir, webhook_urls, delay, delete_opt, poll_interval, recompress, quality
+            )
+            self.monitor.start()
             
             self.monitor_btn.setText("Stop Monitoring")
             self.set_status_label(True)
             self.config["monitoring_active"] = True
 
         # Save the updated monitoring state to the config file
+        self._save_timer.start()
+
+    def _flush_config(self):
+        self._save_timer.stop()
         save_config(self.config)
 
     def log(self, message, level="info"):
@@ -605,7 +1055,28 @@ class SteamcorderMainWindow(QMainWindow):
         }
         color = color_map.get(level, "#f8f8f2")
         timestamp = time.strftime("%H:%M:%S")
-        self.log_text.append(f'<span style="color: #bd93f9;">[{timestamp}]</span> <span style="color: {color};">{message}</span>')
+        self._log_buffer.append(f'<span style="color: #bd93f9;">[{timestamp}]</span> <span style="color: {color};">{message}</span>')
+
+    def _flush_log(self):
+        """Writes all buffered log lines in a single edit so the view lays out once per batch."""
+        if not self._log_buffer:
+            return
+        batch = [self._log_buffer.popleft() for _ in range(len(self._log_buffer))]
+
+        scrollbar = self.log_text.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+
+        cursor = QTextCursor(self.log_text.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for line in batch:
+            if not self.log_text.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertHtml(line)
+        cursor.endEditBlock()
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
 
     def tray_icon_clicked(self, reason):
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
@@ -636,8 +1107,11 @@ class SteamcorderMainWindow(QMainWindow):
         Gracefully stops the monitoring thread and exits the application.
         This is the central point for quitting the app, ensuring cleanup happens correctly.
         """
-        if self.monitoring_thread and self.monitoring_thread.isRunning():
-            self.monitoring_thread.stop()
+        if self.monitor and self.monitor.is_running():
+            self.monitor.stop()
+        if self._save_timer.isActive():
+            self._flush_config()
+        self._log_timer.stop()
         self.tray_icon.hide()
         QApplication.quit()
 
@@ -649,6 +1123,8 @@ def main():
     # Enable high-DPI scaling for better multi-monitor support
     QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
     
+    # Must be set before any window exists, or the taskbar groups the app under python.exe
+    import ctypes
     myappid = f'imfeys.Steamcorder.{SteamcorderMainWindow.APP_VERSION}'
     ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
     